@@ -95,17 +95,25 @@ export default function App() {
 
     const init = async () => {
       try {
-        const [sourcesRes, statusRes, stagesRes] = await Promise.all([
-          fetch('/api/sources'),
-          fetch('/api/status'),
-          fetch('/api/stages')
-        ])
+        const batchRes = await fetch('/api/batch', {
+          method: 'POST',
+          headers: { 'Content-Type': 'application/json' },
+          body: JSON.stringify({
+            requests: [
+              { id: 'sources', path: '/api/sources' },
+              { id: 'status', path: '/api/status' },
+              { id: 'stages', path: '/api/stages' },
+            ],
+          }),
+        })
 
         if (!mounted) return
 
-        const sourcesData = await sourcesRes.json()
-        const statusData = await statusRes.json()
-        const stagesData = await stagesRes.json()
+        const { responses } = await batchRes.json()
+        const byId = Object.fromEntries(responses.map(r => [r.id, r.body]))
+        const sourcesData = byId.sources
+        const statusData = byId.status
+        const stagesData = byId.stages
 
         setSources(sourcesData)
         setRunning(statusData.is_running)
@@ -173,6 +181,8 @@ export default function App() {
 
         if (msg.event === 'pipeline_start') {
           setRunning(true)
+          // A full run resets every stage server-side; mirror it for other open dashboards
+          if (!msg.data?.single_stage) setStages(INITIAL_STAGES)
           setValidation(null)
           setProgress({})
           setStreamingText('')
@@ -13,6 +13,8 @@ import sys
 import time
 from pathlib import Path
 
+import orjson
+
 ROOT = Path(__file__).parent
 sys.path.insert(0, str(ROOT))
 
@@ -22,12 +24,12 @@ from src.pipeline.assembler import Assembler
 from src.pipeline.llm import LLM
 from src.pipeline.validator import Validator
 from src.pipeline.docs_validator import OfficialDocsValidator
+from src.pipeline.config_cache import load_yaml
 
 
 def load_config():
-    import yaml
     with open(ROOT / "config" / "config.yaml") as f:
-        return yaml.safe_load(f)
+        return load_yaml(f)
 
 
 def log(msg, quiet=False):
@@ -136,8 +138,8 @@ def run_validate(text, quiet=False):
 
     validator = Validator()
 
-    final_result = validator.validate_final(text)
     patterns = validator.find_patterns(text)
+    final_result = validator.validate_final(text, found=patterns)
 
     def strict_progress(current, total, msg):
         if current == total:
@@ -189,7 +191,9 @@ def run_validate(text, quiet=False):
 
     release_dir = ROOT.parent / "release"
     release_dir.mkdir(exist_ok=True)
-    (release_dir / "candidate.validation.json").write_text(json.dumps(validation_data, indent=2))
+    (release_dir / "candidate.validation.json").write_bytes(
+        orjson.dumps(validation_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    )
 
     return validation_data
 
@@ -5,70 +5,161 @@ from pathlib import Path
 from typing import Optional
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+import orjson
+import yaml
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, ConfigDict
 
 from .runner import PipelineRunner
 from ..pipeline.sources import SourceManager, Source, SourceType
+from ..pipeline.config_cache import read_config_text, load_yaml
 from ..pipeline.validator import Validator
 from ..pipeline.docs_validator import OfficialDocsValidator
 
 
+ROOT = Path(__file__).parents[2]
+CONFIG_DIR = ROOT / "config"
+CONFIG_PATH = CONFIG_DIR / "config.yaml"
+OUTPUT_PATH = ROOT / "output" / "2_final" / "jac_reference.txt"
+CANDIDATE_PATH = ROOT.parent / "release" / "candidate.txt"
+
+_SPAWN_RE = re.compile(r'\bspawn\s+\w+|\w+\s+spawn\b')
+
+
 class SourceCreate(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
     id: str
     git_url: str
     branch: str = "main"
     path: str = "."
     source_type: str = "docs"
     enabled: bool = True
-    file_patterns: list[str] = None
+    file_patterns: Optional[list[str]] = None
 
 
 class SourceUpdate(BaseModel):
-    git_url: str = None
-    branch: str = None
-    path: str = None
-    source_type: str = None
-    enabled: bool = None
-    file_patterns: list[str] = None
+    model_config = ConfigDict(extra='forbid')
+
+    git_url: Optional[str] = None
+    branch: Optional[str] = None
+    path: Optional[str] = None
+    source_type: Optional[str] = None
+    enabled: Optional[bool] = None
+    file_patterns: Optional[list[str]] = None
+
+
+class BatchItem(BaseModel):
+    id: str
+    path: str
+
+
+class BatchRequest(BaseModel):
+    requests: list[BatchItem]
 
 
 class ConnectionManager:
+    """Fans events out to dashboard clients.
+
+    Each client gets a bounded outbound queue drained by its own writer task,
+    so a broadcast is one put_nowait per client and a stalled peer only
+    affects itself. A client whose queue fills up is dropped and closed.
+    """
+
+    QUEUE_SIZE = 64
+    CLOSE_TIMEOUT = 5.0
+
     def __init__(self):
-        self.connections: list[WebSocket] = []
+        self.connections: dict[WebSocket, tuple[asyncio.Queue, asyncio.Task]] = {}
+        self._closing: set[asyncio.Task] = set()
 
     async def connect(self, ws: WebSocket):
         await ws.accept()
-        self.connections.append(ws)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self.connections[ws] = (queue, asyncio.create_task(self._drain(ws, queue)))
 
     def disconnect(self, ws: WebSocket):
-        if ws in self.connections:
-            self.connections.remove(ws)
+        entry = self.connections.pop(ws, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    async def _drain(self, ws: WebSocket, queue: asyncio.Queue):
+        try:
+            while True:
+                await ws.send_text(await queue.get())
+        except (WebSocketDisconnect, OSError, RuntimeError):
+            # RuntimeError covers sends after close; OSError covers uvicorn's
+            # ClientDisconnected on Starlette versions that don't wrap it.
+            pass
+        finally:
+            # However the writer ends, unregister the client, unless ws has
+            # since reconnected under a newer writer.
+            entry = self.connections.get(ws)
+            if entry is not None and entry[1] is asyncio.current_task():
+                del self.connections[ws]
+
+    def _drop(self, ws: WebSocket):
+        # The writer may be blocked sending to a stalled peer, so cancel it
+        # rather than waiting for it; the dashboard reconnects on close.
+        _, writer = self.connections.pop(ws)
+        writer.cancel()
+        task = asyncio.create_task(self._close(ws))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close(self, ws: WebSocket):
+        try:
+            await asyncio.wait_for(ws.close(code=1013), self.CLOSE_TIMEOUT)
+        except (asyncio.TimeoutError, WebSocketDisconnect, OSError, RuntimeError):
+            pass
+
+    async def shutdown(self):
+        """Cancel every writer and pending close; called when the app stops."""
+        tasks = [writer for _, writer in self.connections.values()] + list(self._closing)
+        self.connections.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
     async def broadcast(self, data: dict):
-        for ws in self.connections[:]:
+        # Encode once rather than per client.
+        payload = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+        dead = []
+        for ws, (queue, _) in self.connections.items():
             try:
-                await ws.send_json(data)
-            except:
-                self.disconnect(ws)
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                dead.append(ws)
+        for ws in dead:
+            self._drop(ws)
 
 
 manager = ConnectionManager()
 runner: Optional[PipelineRunner] = None
 source_manager: Optional[SourceManager] = None
+validator: Optional[Validator] = None
+docs_validator: Optional[OfficialDocsValidator] = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global runner, source_manager
-    config_path = Path(__file__).parents[2] / "config" / "config.yaml"
-    runner = PipelineRunner(config_path, manager.broadcast)
-    source_manager = SourceManager(config_path)
+    global runner, source_manager, validator, docs_validator
+    runner = PipelineRunner(CONFIG_PATH, manager.broadcast)
+    source_manager = SourceManager(CONFIG_PATH)
+    # Share the runner's instances so the official docs are parsed once
+    validator = runner.validator
+    docs_validator = runner.docs_validator
+    app.state.bg_tasks = set()
     yield
+    await manager.shutdown()
 
 
-app = FastAPI(title="Pipeline Dashboard", lifespan=lifespan)
+app = FastAPI(
+    title="Pipeline Dashboard",
+    lifespan=lifespan,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -103,12 +194,21 @@ async def get_metrics():
     return {}
 
 
+def _spawn(coro) -> asyncio.Task:
+    # The event loop only keeps weak references to tasks; hold a strong one
+    # until the run finishes so it can't be garbage-collected mid-flight.
+    task = asyncio.create_task(coro)
+    app.state.bg_tasks.add(task)
+    task.add_done_callback(app.state.bg_tasks.discard)
+    return task
+
+
 @app.post("/api/run")
 async def run_pipeline():
     if runner:
         if runner.is_running:
             return {"error": "Pipeline already running"}
-        asyncio.create_task(runner.run())
+        _spawn(runner.run())
         return {"status": "started"}
     return {"error": "Runner not initialized"}
 
@@ -121,7 +221,7 @@ async def run_stage(stage: str):
     if runner:
         if runner.is_running:
             return {"error": "Pipeline already running"}
-        asyncio.create_task(runner.run_stage(stage))
+        _spawn(runner.run_stage(stage))
         return {"status": "started", "stage": stage}
     return {"error": "Runner not initialized"}
 
@@ -136,7 +236,7 @@ async def get_stages():
 @app.get("/api/sources")
 async def list_sources():
     if source_manager:
-        return [s.to_dict() for s in source_manager.list()]
+        return source_manager.list_dicts()
     return []
 
 
@@ -210,38 +310,68 @@ async def toggle_source(source_id: str):
     return result.to_dict()
 
 
-# Config and Prompts API
-CONFIG_DIR = Path(__file__).parents[2] / "config"
+BATCH_HANDLERS = {
+    "/api/status": get_status,
+    "/api/metrics": get_metrics,
+    "/api/stages": get_stages,
+    "/api/sources": list_sources,
+}
+
+
+@app.post("/api/batch")
+async def batch(data: BatchRequest):
+    """Serve several read-only GETs in one round-trip."""
+    async def dispatch(item: BatchItem) -> dict:
+        handler = BATCH_HANDLERS.get(item.path)
+        if handler is None:
+            return {"id": item.id, "status": 404, "body": {"detail": "Not batchable"}}
+        return {"id": item.id, "status": 200, "body": await handler()}
+
+    return {"responses": await asyncio.gather(*(dispatch(r) for r in data.requests))}
+
+
+def _wants_plain_text(request: Request, format: Optional[str]) -> bool:
+    """Raw file bodies go to clients that ask for text/plain; JSON stays the default."""
+    return format != "json" and "text/plain" in request.headers.get("accept", "")
+
 
+# Config and Prompts API
 @app.get("/api/config")
-async def get_config():
-    config_path = CONFIG_DIR / "config.yaml"
-    if not config_path.exists():
+async def get_config(request: Request, format: Optional[str] = None):
+    if not CONFIG_PATH.exists():
         raise HTTPException(status_code=404, detail="Config file not found")
-    return {"content": config_path.read_text()}
+    if _wants_plain_text(request, format):
+        return FileResponse(CONFIG_PATH, media_type="text/plain")
+    return {"content": await asyncio.to_thread(read_config_text, CONFIG_PATH)}
 
 
 @app.put("/api/config")
 async def update_config(data: dict):
-    config_path = CONFIG_DIR / "config.yaml"
     try:
-        import yaml
-        yaml.safe_load(data["content"])
-        config_path.write_text(data["content"])
+        load_yaml(data["content"])
+        await asyncio.to_thread(CONFIG_PATH.write_text, data["content"])
         return {"status": "saved"}
     except yaml.YAMLError as e:
         raise HTTPException(status_code=400, detail=f"Invalid YAML: {e}")
 
 
+# (config dir mtime_ns, prompt listing); adding or removing a file bumps the mtime.
+_prompts_cache: Optional[tuple[int, list[dict]]] = None
+
+
 @app.get("/api/prompts")
 async def list_prompts():
-    prompts = []
-    for f in CONFIG_DIR.glob("*_prompt.txt"):
-        prompts.append({
-            "name": f.stem,
-            "filename": f.name
-        })
-    return prompts
+    global _prompts_cache
+    mtime = CONFIG_DIR.stat().st_mtime_ns
+    if _prompts_cache is None or _prompts_cache[0] != mtime:
+        prompts = []
+        for f in CONFIG_DIR.glob("*_prompt.txt"):
+            prompts.append({
+                "name": f.stem,
+                "filename": f.name
+            })
+        _prompts_cache = (mtime, prompts)
+    return _prompts_cache[1]
 
 
 @app.get("/api/prompts/{filename}")
@@ -249,7 +379,7 @@ async def get_prompt(filename: str):
     prompt_path = CONFIG_DIR / filename
     if not prompt_path.exists() or not filename.endswith("_prompt.txt"):
         raise HTTPException(status_code=404, detail="Prompt file not found")
-    return {"filename": filename, "content": prompt_path.read_text()}
+    return {"filename": filename, "content": await asyncio.to_thread(prompt_path.read_text)}
 
 
 @app.put("/api/prompts/{filename}")
@@ -257,32 +387,26 @@ async def update_prompt(filename: str, data: dict):
     if not filename.endswith("_prompt.txt"):
         raise HTTPException(status_code=400, detail="Invalid prompt filename")
     prompt_path = CONFIG_DIR / filename
-    prompt_path.write_text(data["content"])
+    await asyncio.to_thread(prompt_path.write_text, data["content"])
     return {"status": "saved", "filename": filename}
 
 
-ROOT = Path(__file__).parents[2]
-
-
 @app.post("/api/validate")
 async def validate_output():
     """Validate the current output against jac check and official docs."""
-    output_path = ROOT / "output" / "2_final" / "jac_reference.txt"
+    output_path = OUTPUT_PATH
     if not output_path.exists():
-        release_path = ROOT.parent / "release" / "candidate.txt"
-        if release_path.exists():
-            output_path = release_path
+        if CANDIDATE_PATH.exists():
+            output_path = CANDIDATE_PATH
         else:
             raise HTTPException(status_code=404, detail="No output to validate")
 
-    text = output_path.read_text()
-
-    validator = Validator()
-    docs_validator = OfficialDocsValidator()
-
-    jac_results = validator.validate_all_examples(text)
+    text = await asyncio.to_thread(output_path.read_text)
 
-    syntax_verification = docs_validator.validate_syntax_in_output(text)
+    jac_results, syntax_verification = await asyncio.gather(
+        asyncio.to_thread(validator.validate_all_examples, text, max_errors=10),
+        asyncio.to_thread(docs_validator.validate_syntax_in_output, text),
+    )
     syntax_results = {
         v.construct: {
             "expected": v.expected,
@@ -293,9 +417,7 @@ async def validate_output():
     }
 
     pattern_checks = {
-        'spawn_correct': bool(
-            re.search(r'\bspawn\s+\w+|\w+\s+spawn\b', text)
-        ),
+        'spawn_correct': bool(_SPAWN_RE.search(text)),
         'tuple_correct': '(a, b) =' in text or '(x, y) =' in text,
         'connect_correct': '+>:' in text and ':+>' in text,
         'by_llm_correct': 'by llm;' in text or 'by llm(' in text,
@@ -314,7 +436,7 @@ async def validate_output():
             "failed": jac_results.failed,
             "skipped": jac_results.skipped,
             "pass_rate": jac_results.pass_rate,
-            "errors": jac_results.errors[:10]
+            "errors": jac_results.errors
         },
         "syntax_verification": syntax_results,
         "pattern_checks": pattern_checks,
@@ -327,14 +449,14 @@ async def validate_output():
 @app.get("/api/validate/docs-info")
 async def get_docs_info():
     """Get information about loaded official docs for debugging."""
-    docs_validator = OfficialDocsValidator()
     return docs_validator.get_docs_summary()
 
 
 @app.get("/api/candidate")
-async def get_candidate():
+async def get_candidate(request: Request, format: Optional[str] = None):
     """Get the current candidate.txt content."""
-    release_path = ROOT.parent / "release" / "candidate.txt"
-    if not release_path.exists():
+    if not CANDIDATE_PATH.exists():
         raise HTTPException(status_code=404, detail="No candidate.txt found")
-    return {"content": release_path.read_text()}
+    if _wants_plain_text(request, format):
+        return FileResponse(CANDIDATE_PATH, media_type="text/plain")
+    return {"content": await asyncio.to_thread(CANDIDATE_PATH.read_text)}
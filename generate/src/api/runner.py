@@ -1,24 +1,73 @@
 #!/usr/bin/env python3
 import asyncio
-import json
-import yaml
+import functools
+import os
 import shutil
 import time
 import traceback
 import sys
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from typing import Callable, Optional
-from dataclasses import dataclass, field, asdict
+from typing import Callable, Iterator, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 
+import orjson
 import tiktoken
 
 from ..pipeline.llm import LLM
 from ..pipeline.sanitizer import Sanitizer
 from ..pipeline.deterministic_extractor import DeterministicExtractor
 from ..pipeline.assembler import Assembler
-from ..pipeline.validator import Validator, JacCheckResult, ValidationError
+from ..pipeline.validator import Validator
 from ..pipeline.docs_validator import OfficialDocsValidator
+from ..pipeline.config_cache import load_config
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoder(name: str):
+    # Loading the BPE tables is the expensive part; keep one encoder per process.
+    return tiktoken.get_encoding(name)
+
+
+@functools.lru_cache(maxsize=1)
+def _iso_second(second: int) -> str:
+    # emit() fires for every progress tick; format each wall-clock second once.
+    return datetime.fromtimestamp(second).isoformat()
+
+
+def _walk_md(root: Path) -> Iterator[tuple[str, int]]:
+    """Yield (path, size) for each .md file under root, like rglob("*.md").
+
+    Uses scandir so each file costs one stat and no Path object.
+    """
+    if not root.is_dir():
+        return
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    yield entry.path, entry.stat().st_size
+
+
+def _md_totals(root: Path) -> tuple[int, int]:
+    """Return (total bytes, file count) of the .md files under root."""
+    total = count = 0
+    for _, size in _walk_md(root):
+        total += size
+        count += 1
+    return total, count
+
+
+# Stage/pipeline transitions; pending progress is flushed before each one.
+TRANSITION_EVENTS = frozenset({
+    "pipeline_start", "pipeline_complete", "pipeline_error",
+    "stage_start", "stage_complete", "stage_error",
+})
 
 
 @dataclass
@@ -50,10 +99,49 @@ class StageMetrics:
         return 1.0
 
     def to_dict(self):
-        d = asdict(self)
-        d['duration'] = self.duration
-        d['compression_ratio'] = self.compression_ratio
-        return d
+        # Shallow on purpose (asdict deep-copies files/extra on every poll);
+        # callers must not mutate the returned lists/dicts.
+        return {
+            "name": self.name,
+            "status": self.status,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "input_size": self.input_size,
+            "output_size": self.output_size,
+            "file_count": self.file_count,
+            "files": self.files,
+            "error": self.error,
+            "progress": self.progress,
+            "progress_total": self.progress_total,
+            "progress_message": self.progress_message,
+            "extra": self.extra,
+            "duration": self.duration,
+            "compression_ratio": self.compression_ratio,
+        }
+
+
+class _ProgressEmitter:
+    """Per-stage progress callback, created once per runner and reused by every run."""
+
+    __slots__ = ("runner", "stage_name", "stage")
+
+    def __init__(self, runner: "PipelineRunner", stage_name: str):
+        self.runner = runner
+        self.stage_name = stage_name
+        self.stage = runner.stages[stage_name]
+
+    def __call__(self, current: int, total: int, message: str = ""):
+        stage = self.stage
+        stage.progress = current
+        stage.progress_total = total
+        stage.progress_message = message
+
+        self.runner._post_progress({
+            "stage": self.stage_name,
+            "current": current,
+            "total": total,
+            "message": message
+        })
 
 
 class PipelineRunner:
@@ -68,13 +156,16 @@ class PipelineRunner:
 
     def __init__(self, config_path: Path, broadcast: Callable):
         self.root = Path(__file__).parents[2]
-        with open(config_path) as f:
-            self.cfg = yaml.safe_load(f)
+        self.cfg = load_config(config_path)
         source_dir = Path(self.cfg['source_dir'])
         self.src = source_dir if source_dir.is_absolute() else self.root / source_dir
         self.broadcast = broadcast
         self.is_running = False
         self.validator = Validator()
+        self.docs_validator = OfficialDocsValidator()
+        # Stage workers hold no per-run state, so one of each serves every run.
+        self.sanitizer = Sanitizer(self.cfg)
+        self.extractor = DeterministicExtractor(self.cfg, docs_validator=self.docs_validator)
         self.loop = None
 
         self.sanitized_dir = self.root / "output" / "0_sanitized"
@@ -86,38 +177,54 @@ class PipelineRunner:
             "extract": StageMetrics(name="Deterministic Extract"),
             "assemble": StageMetrics(name="LLM Assembly"),
         }
+        self._progress = {name: _ProgressEmitter(self, name) for name in self.stages}
+        # Latest unsent progress payload per stage; worker threads overwrite,
+        # _drain_progress sends whatever is current.
+        self._progress_latest: dict[str, dict] = {}
+        self._progress_event = asyncio.Event()
 
         self.overall_start: Optional[float] = None
         self.overall_end: Optional[float] = None
         self.final_validation: Optional[dict] = None
 
     async def emit(self, event: str, data: dict):
+        if event in TRANSITION_EVENTS:
+            # Keep pending progress ahead of the transition it belongs to.
+            await self._flush_progress()
         await self.broadcast({
             "event": event,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _iso_second(int(time.time())),
             "data": data
         })
 
-    def _make_progress_callback(self, stage_name: str):
-        stage = self.stages[stage_name]
+    def _post_progress(self, payload: dict):
+        """Record a progress tick; safe to call from worker threads."""
+        self._progress_latest[payload["stage"]] = payload
+        if self.loop and not self._progress_event.is_set():
+            self.loop.call_soon_threadsafe(self._progress_event.set)
+
+    async def _flush_progress(self):
+        latest = self._progress_latest
+        while latest:
+            _, payload = latest.popitem()
+            await self.emit("progress", payload)
+
+    async def _drain_progress(self):
+        while True:
+            await self._progress_event.wait()
+            self._progress_event.clear()
+            await self._flush_progress()
+            await asyncio.sleep(0.05)
+
+    async def _to_thread(self, fn, *args, **kwargs):
+        # run_in_executor without to_thread's contextvars copy; the stages
+        # don't use context variables.
+        if kwargs:
+            fn = functools.partial(fn, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
 
-        def callback(current: int, total: int, message: str = ""):
-            stage.progress = current
-            stage.progress_total = total
-            stage.progress_message = message
-
-            if self.loop:
-                asyncio.run_coroutine_threadsafe(
-                    self.emit("progress", {
-                        "stage": stage_name,
-                        "current": current,
-                        "total": total,
-                        "message": message
-                    }),
-                    self.loop
-                )
-
-        return callback
+    def _make_progress_callback(self, stage_name: str):
+        return self._progress[stage_name]
 
     def get_status(self) -> dict:
         return {
@@ -149,6 +256,7 @@ class PipelineRunner:
 
         self.is_running = True
         self.loop = asyncio.get_event_loop()
+        progress_drainer = asyncio.create_task(self._drain_progress())
         self.overall_start = time.time()
 
         for stage in self.stages.values():
@@ -165,7 +273,7 @@ class PipelineRunner:
         try:
             out = self.root / "output"
             if out.exists():
-                shutil.rmtree(out)
+                await self._to_thread(shutil.rmtree, out)
 
             await self._run_fetch()
             await self._run_extract()
@@ -177,6 +285,8 @@ class PipelineRunner:
         except Exception as e:
             await self.emit("pipeline_error", {"error": str(e)})
         finally:
+            progress_drainer.cancel()
+            await asyncio.gather(progress_drainer, return_exceptions=True)
             self.is_running = False
 
     async def run_stage(self, stage_name: str):
@@ -185,6 +295,7 @@ class PipelineRunner:
 
         self.is_running = True
         self.loop = asyncio.get_event_loop()
+        progress_drainer = asyncio.create_task(self._drain_progress())
 
         stage = self.stages[stage_name]
         stage.status = "pending"
@@ -209,6 +320,8 @@ class PipelineRunner:
         except Exception as e:
             await self.emit("pipeline_error", {"error": str(e), "stage": stage_name})
         finally:
+            progress_drainer.cancel()
+            await asyncio.gather(progress_drainer, return_exceptions=True)
             self.is_running = False
 
     async def _run_fetch(self):
@@ -219,22 +332,16 @@ class PipelineRunner:
         await self.emit("stage_start", {"stage": "fetch"})
 
         try:
-            sanitizer = Sanitizer(self.cfg)
-
             def fetch_progress(source_id: str, current: int, total: int):
-                if self.loop:
-                    asyncio.run_coroutine_threadsafe(
-                        self.emit("progress", {
-                            "stage": "fetch",
-                            "current": current,
-                            "total": total,
-                            "message": f"Fetching {source_id}..."
-                        }),
-                        self.loop
-                    )
-
-            stats = await asyncio.to_thread(
-                sanitizer.run, self.src, self.sanitized_dir, fetch_progress
+                self._post_progress({
+                    "stage": "fetch",
+                    "current": current,
+                    "total": total,
+                    "message": f"Fetching {source_id}..."
+                })
+
+            stats = await self._to_thread(
+                self.sanitizer.run, self.src, self.sanitized_dir, fetch_progress
             )
 
             input_size = 0
@@ -247,11 +354,10 @@ class PipelineRunner:
             stage.input_size = input_size
             stage.file_count = input_file_count
 
-            out_files = list(self.sanitized_dir.rglob("*.md"))
-            stage.output_size = sum(f.stat().st_size for f in out_files)
+            stage.output_size, _ = _md_totals(self.sanitized_dir)
             stage.files = [
                 {"name": f["path"], "size": f["cleaned_size"]}
-                for f in stats.get("files", [])[:20]
+                for f in islice(stats.get("files") or (), 20)
             ]
             stage.extra = {
                 "jac_files": stats.get("jac_files", 0),
@@ -291,25 +397,21 @@ class PipelineRunner:
         await self.emit("stage_start", {"stage": "extract"})
 
         try:
-            source_files = list(self.sanitized_dir.rglob("*.md"))
-            stage.input_size = sum(f.stat().st_size for f in source_files)
-            stage.file_count = len(source_files)
+            stage.input_size, stage.file_count = _md_totals(self.sanitized_dir)
 
             progress_cb = self._make_progress_callback("extract")
             progress_cb(0, 3, "Initializing extractor...")
 
-            extractor = DeterministicExtractor(self.cfg)
-
             progress_cb(1, 3, "Extracting signatures and examples...")
-            extracted = await asyncio.to_thread(
-                extractor.extract_from_directory, self.sanitized_dir
+            extracted = await self._to_thread(
+                self.extractor.extract_from_directory, self.sanitized_dir
             )
 
             progress_cb(2, 3, "Selecting best examples...")
-            best_examples = extractor.select_best_examples(extracted, max_per_type=3)
+            best_examples = self.extractor.select_best_examples(extracted, max_per_type=3)
 
             progress_cb(3, 3, "Formatting output...")
-            formatted = extractor.format_for_assembly(extracted)
+            formatted = self.extractor.format_for_assembly(extracted)
 
             self.extracted_dir.mkdir(parents=True, exist_ok=True)
             output_path = self.extracted_dir / "extracted_content.txt"
@@ -327,7 +429,6 @@ class PipelineRunner:
 
             # Store for assembly stage
             self._extracted_content = extracted
-            self._extractor = extractor
 
             stage.status = "complete"
             stage.end_time = time.time()
@@ -356,64 +457,79 @@ class PipelineRunner:
         try:
             # Get extracted content
             if not hasattr(self, '_extracted_content'):
-                extractor = DeterministicExtractor(self.cfg)
-                self._extracted_content = extractor.extract_from_directory(self.sanitized_dir)
-                self._extractor = extractor
+                self._extracted_content = self.extractor.extract_from_directory(self.sanitized_dir)
 
             extracted_path = self.extracted_dir / "extracted_content.txt"
             stage.input_size = extracted_path.stat().st_size if extracted_path.exists() else 0
 
             progress_cb = self._make_progress_callback("assemble")
 
-            token_buffer = []
-            last_emit_time = [time.time()]
+            # The LLM thread only appends; a task on the loop flushes every 100ms,
+            # so streaming costs no cross-thread scheduling per chunk.
+            token_queue: deque[str] = deque()
+
+            # Count tokens per chunk as they stream in (summing chunk counts can
+            # differ slightly from encoding the whole text at chunk seams).
+            try:
+                enc = _get_encoder("cl100k_base")
+            except Exception:
+                enc = None
+            streamed_tokens = 0
 
             def on_token(token: str):
-                token_buffer.append(token)
-                now = time.time()
-                if now - last_emit_time[0] > 0.1 or len(token_buffer) > 50:
-                    if self.loop:
-                        chunk = ''.join(token_buffer)
-                        token_buffer.clear()
-                        last_emit_time[0] = now
-                        asyncio.run_coroutine_threadsafe(
-                            self.emit("llm_token", {"stage": "assemble", "token": chunk}),
-                            self.loop
-                        )
+                nonlocal streamed_tokens
+                token_queue.append(token)
+                if enc is not None:
+                    streamed_tokens += len(enc.encode_ordinary(token))
+
+            async def flush_tokens():
+                if token_queue:
+                    chunk = ''.join([token_queue.popleft() for _ in range(len(token_queue))])
+                    await self.emit("llm_token", {"stage": "assemble", "token": chunk})
+
+            async def drain_tokens():
+                while True:
+                    await asyncio.sleep(0.1)
+                    await flush_tokens()
 
             llm = LLM(self.cfg, self.cfg.get('assembly', {}))
             assembler = Assembler(llm, self.cfg, on_progress=progress_cb, on_token=on_token)
 
-            result = await asyncio.to_thread(
-                assembler.assemble, self._extracted_content, self._extractor
-            )
+            drainer = asyncio.create_task(drain_tokens())
+            try:
+                result = await self._to_thread(
+                    assembler.assemble, self._extracted_content, self.extractor
+                )
+            finally:
+                drainer.cancel()
+                await asyncio.gather(drainer, return_exceptions=True)
 
-            if token_buffer:
-                await self.emit("llm_token", {"stage": "assemble", "token": ''.join(token_buffer)})
+            await flush_tokens()
 
+            # Encode once; the same bytes go to the output and release copies.
+            data = result.encode("utf-8")
             self.final_dir.mkdir(parents=True, exist_ok=True)
             output_path = self.final_dir / "jac_reference.txt"
-            output_path.write_text(result)
+            output_path.write_bytes(data)
 
             # Also save to release
             release_dir = self.root.parent / "release"
             release_dir.mkdir(exist_ok=True)
-            (release_dir / "candidate.txt").write_text(result)
+            (release_dir / "candidate.txt").write_bytes(data)
 
             # Run jac check before saving validation (will be added to final_validation below)
 
-            stage.output_size = len(result)
+            stage.output_size = len(data)
             stage.files = [{"name": output_path.name, "size": stage.output_size}]
 
             # Validate patterns
-            validation_result = self.validator.validate_final(result)
             patterns = self.validator.find_patterns(result)
+            validation_result = self.validator.validate_final(result, found=patterns)
 
-            # Count tokens using tiktoken (cl100k_base is used by GPT-4, Claude uses similar)
-            try:
-                enc = tiktoken.get_encoding("cl100k_base")
-                token_count = len(enc.encode(result))
-            except Exception:
+            # Token count via tiktoken (cl100k_base is used by GPT-4, Claude uses similar)
+            if enc is not None:
+                token_count = streamed_tokens
+            else:
                 token_count = len(result) // 4  # rough estimate fallback
 
             progress_cb(0, 4, "Running strict validation on all code blocks...")
@@ -454,8 +570,7 @@ class PipelineRunner:
             })
 
             progress_cb(1, 3, "Verifying syntax patterns...")
-            docs_validator = OfficialDocsValidator()
-            syntax_verification = docs_validator.validate_syntax_in_output(result)
+            syntax_verification = self.docs_validator.validate_syntax_in_output(result)
             syntax_results = {
                 v.construct: {
                     "expected": v.expected,
@@ -500,7 +615,9 @@ class PipelineRunner:
 
             # Save validation results as JSON
             validation_json_path = release_dir / "candidate.validation.json"
-            validation_json_path.write_text(json.dumps(self.final_validation, indent=2))
+            validation_json_path.write_bytes(
+                orjson.dumps(self.final_validation, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            )
 
             stage.extra = {
                 "validation": self.final_validation,
@@ -6,6 +6,7 @@ Uses ONE LLM call with template-driven structure.
 """
 
 from pathlib import Path
+from .config_cache import load_yaml
 from .llm import LLM
 from .deterministic_extractor import DeterministicExtractor, ExtractedContent
 
@@ -55,11 +56,10 @@ class LosslessPipeline:
     """
 
     def __init__(self, config_path: Path):
-        import yaml
         self.root = Path(__file__).parents[2]
 
         with open(config_path) as f:
-            self.config = yaml.safe_load(f)
+            self.config = load_yaml(f)
 
         self.extractor = DeterministicExtractor(self.config)
         self.llm = LLM(self.config, self.config.get('assembly', {}))
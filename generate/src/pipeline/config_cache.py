@@ -0,0 +1,63 @@
+"""
+Shared cache for YAML config files.
+
+Files are re-read only when their mtime or size changes, so dashboard
+requests and pipeline runs don't re-read and re-parse an unchanged config.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+MAX_ENTRIES = 100
+
+_UNPARSED = object()
+
+# path -> [(mtime_ns, size), raw text, parsed YAML or _UNPARSED]
+_cache: OrderedDict[str, list] = OrderedDict()
+_lock = threading.Lock()
+
+
+def _entry(path: Path) -> list:
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = str(path)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == stamp:
+            _cache.move_to_end(key)
+            return entry
+        entry = [stamp, Path(path).read_text(), _UNPARSED]
+        _cache[key] = entry
+        if len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+        return entry
+
+
+def load_yaml(stream):
+    """Safe-load YAML, using the libyaml C loader when PyYAML was built with it."""
+    return yaml.load(stream, Loader=_YamlLoader)
+
+
+def read_config_text(path: Path) -> str:
+    """Return the raw text of a config file."""
+    return _entry(path)[1]
+
+
+def load_config(path: Path) -> dict:
+    """Return the parsed YAML of a config file.
+
+    The dict is shared between callers and must be treated as read-only.
+    """
+    entry = _entry(path)
+    if entry[2] is _UNPARSED:
+        entry[2] = load_yaml(entry[1])
+    return entry[2]
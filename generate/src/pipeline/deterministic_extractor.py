@@ -5,12 +5,14 @@ Stage 1 of the lossless pipeline: extracts all content without LLM involvement.
 Categorizes code blocks and signatures by construct type.
 """
 
+import heapq
 import re
-import yaml
 from pathlib import Path
 from dataclasses import dataclass, field
 from collections import defaultdict
 
+from .config_cache import load_yaml
+
 
 @dataclass
 class CodeExample:
@@ -18,6 +20,7 @@ class CodeExample:
     source_file: str
     construct_type: str
     has_keywords: list[str] = field(default_factory=list)
+    construct_types: list[str] = field(default_factory=list)
     line_count: int = 0
 
     def __post_init__(self):
@@ -65,6 +68,32 @@ class DeterministicExtractor:
         'react_hook': r'\buse[A-Z]\w*\s*\(',
     }
 
+    # Construct patterns that MUST appear for an example to be valid for that type
+    CONSTRUCT_REQUIREMENTS = {
+        'node': r'\bnode\s+\w+',
+        'edge': r'\bedge\s+\w+',
+        'walker': r'\bwalker\s+\w+',
+        'obj': r'\bobj\s+\w+',
+        'enum': r'\benum\s+\w+',
+        'can': r'\bcan\s+\w+',
+        'def': r'\bdef\s+\w+',
+        'with_entry': r'with\s+.*?\s+entry',
+        'with_exit': r'with\s+.*?\s+exit',
+        'by_llm': r'by\s+llm',
+        'spawn': r'\bspawn\b',
+        'visit': r'\bvisit\b',
+        'connect': r'\+\+>|<\+\+>',
+        'traverse': r'-->|<--|->:.*?:->|<-:.*?:<-',
+        'filter': r'\(\?\w+',
+        'report': r'\breport\b',
+    }
+
+    # Compiled once at import; these run for every example in every file.
+    _CONSTRUCT_RE = {k: re.compile(p, re.IGNORECASE) for k, p in CONSTRUCT_PATTERNS.items()}
+    _REQUIREMENT_RE = {k: re.compile(p) for k, p in CONSTRUCT_REQUIREMENTS.items()}
+    _CODE_BLOCK_RE = re.compile(r'```(jac|python)?\s*\n(.*?)```', re.DOTALL)
+    _WHITESPACE_RE = re.compile(r'\s+')
+
     CRITICAL_KEYWORDS = [
         '++>', '<++>', '-->', '<-->', '+>:', ':<+', '->:', ':->',
         'spawn', 'visit', 'report', 'disengage',
@@ -73,22 +102,24 @@ class DeterministicExtractor:
         '</', '/>', 'useState', 'useEffect'
     ]
 
-    def __init__(self, config: dict = None):
+    def __init__(self, config: dict = None, docs_validator=None):
         self.config = config or {}
-        self.docs_validator = None
+        # Callers that already hold an OfficialDocsValidator can share it
+        self.docs_validator = docs_validator
         root = Path(__file__).parents[2]
         template_path = root / "config" / "reference_template.yaml"
         if template_path.exists():
             with open(template_path) as f:
-                self.template = yaml.safe_load(f)
+                self.template = load_yaml(f)
         else:
             self.template = {'sections': [], 'keywords': {'critical': self.CRITICAL_KEYWORDS}}
 
-        try:
-            from .docs_validator import OfficialDocsValidator
-            self.docs_validator = OfficialDocsValidator()
-        except ImportError:
-            pass
+        if self.docs_validator is None:
+            try:
+                from .docs_validator import OfficialDocsValidator
+                self.docs_validator = OfficialDocsValidator()
+            except ImportError:
+                pass
 
     def extract_from_directory(self, source_dir: Path) -> ExtractedContent:
         """Extract all content from sanitized markdown files."""
@@ -150,9 +181,7 @@ class DeterministicExtractor:
         text = file_path.read_text()
 
         # Find all code blocks
-        code_pattern = re.compile(r'```(jac|python)?\s*\n(.*?)```', re.DOTALL)
-
-        for match in code_pattern.finditer(text):
+        for match in self._CODE_BLOCK_RE.finditer(text):
             lang = match.group(1) or 'jac'
             code = match.group(2).strip()
 
@@ -169,7 +198,8 @@ class DeterministicExtractor:
                 code=code,
                 source_file=file_path.name,
                 construct_type=construct_types[0] if construct_types else 'general',
-                has_keywords=keywords
+                has_keywords=keywords,
+                construct_types=construct_types
             )
 
             # Add to primary construct type
@@ -184,8 +214,8 @@ class DeterministicExtractor:
     def _classify_code(self, code: str) -> list[str]:
         """Classify code block by construct types it demonstrates."""
         types = []
-        for construct, pattern in self.CONSTRUCT_PATTERNS.items():
-            if re.search(pattern, code, re.IGNORECASE):
+        for construct, pattern in self._CONSTRUCT_RE.items():
+            if pattern.search(code):
                 types.append(construct)
         return types
 
@@ -200,80 +230,72 @@ class DeterministicExtractor:
     def select_best_examples(self, content: ExtractedContent, max_per_type: int = 3) -> dict[str, list[CodeExample]]:
         """Select best examples for each construct type."""
         selected = {}
-
-        # Construct patterns that MUST appear for an example to be valid for that type
-        construct_requirements = {
-            'node': r'\bnode\s+\w+',
-            'edge': r'\bedge\s+\w+',
-            'walker': r'\bwalker\s+\w+',
-            'obj': r'\bobj\s+\w+',
-            'enum': r'\benum\s+\w+',
-            'can': r'\bcan\s+\w+',
-            'def': r'\bdef\s+\w+',
-            'with_entry': r'with\s+.*?\s+entry',
-            'with_exit': r'with\s+.*?\s+exit',
-            'by_llm': r'by\s+llm',
-            'spawn': r'\bspawn\b',
-            'visit': r'\bvisit\b',
-            'connect': r'\+\+>|<\+\+>',
-            'traverse': r'-->|<--|->:.*?:->|<-:.*?:<-',
-            'filter': r'\(\?\w+',
-            'report': r'\breport\b',
-        }
+        # Examples are indexed under every construct they match, so score each once
+        scores: dict[int, float] = {}
+
+        def _score(ex: CodeExample) -> float:
+            # Heavily penalize very long examples (likely reference files)
+            if ex.line_count > 50:
+                return -100  # Reject outright
+            if ex.line_count > 30:
+                length_score = -20
+            elif 5 <= ex.line_count <= 20:
+                length_score = 30  # Sweet spot
+            elif ex.line_count < 5:
+                length_score = ex.line_count * 3
+            else:  # 20-30 lines
+                length_score = 20 - (ex.line_count - 20)
+
+            # Moderate bonus for relevant keywords (cap it)
+            keyword_score = min(len(ex.has_keywords) * 5, 25)
+
+            # Bonus for focused examples (fewer constructs = more focused)
+            construct_count = len(ex.construct_types)
+            focus_score = max(0, 20 - construct_count * 3)
+
+            # Bonus for complete patterns
+            completeness = 0
+            if 'spawn' in ex.code and 'walker' in ex.code:
+                completeness += 10
+            if 'visit' in ex.code and ('++>' in ex.code or '-->' in ex.code):
+                completeness += 10
+            if 'with entry' in ex.code.lower():
+                completeness += 5
+
+            return length_score + keyword_score + focus_score + completeness
+
+        def score(ex: CodeExample) -> float:
+            cached = scores.get(id(ex))
+            if cached is None:
+                cached = scores[id(ex)] = _score(ex)
+            return cached
 
         for construct_type, examples in content.examples.items():
             if not examples:
                 continue
 
             # Filter: example must contain the construct it claims to demonstrate
-            requirement = construct_requirements.get(construct_type)
+            requirement = self._REQUIREMENT_RE.get(construct_type)
             if requirement:
-                examples = [ex for ex in examples if re.search(requirement, ex.code)]
+                examples = [ex for ex in examples if requirement.search(ex.code)]
 
             if not examples:
                 continue
 
-            def score(ex: CodeExample) -> float:
-                # Heavily penalize very long examples (likely reference files)
-                if ex.line_count > 50:
-                    return -100  # Reject outright
-                if ex.line_count > 30:
-                    length_score = -20
-                elif 5 <= ex.line_count <= 20:
-                    length_score = 30  # Sweet spot
-                elif ex.line_count < 5:
-                    length_score = ex.line_count * 3
-                else:  # 20-30 lines
-                    length_score = 20 - (ex.line_count - 20)
-
-                # Moderate bonus for relevant keywords (cap it)
-                keyword_score = min(len(ex.has_keywords) * 5, 25)
-
-                # Bonus for focused examples (fewer constructs = more focused)
-                construct_count = len(self._classify_code(ex.code))
-                focus_score = max(0, 20 - construct_count * 3)
-
-                # Bonus for complete patterns
-                completeness = 0
-                if 'spawn' in ex.code and 'walker' in ex.code:
-                    completeness += 10
-                if 'visit' in ex.code and ('++>' in ex.code or '-->' in ex.code):
-                    completeness += 10
-                if 'with entry' in ex.code.lower():
-                    completeness += 5
-
-                return length_score + keyword_score + focus_score + completeness
-
-            sorted_examples = sorted(examples, key=score, reverse=True)
+            # Pop best-first from a heap instead of sorting everything; the
+            # index keeps ties in their original order, as sorted() would.
+            ranked = [(-score(ex), i, ex) for i, ex in enumerate(examples)]
+            heapq.heapify(ranked)
 
             # Deduplicate: use first 150 chars as signature
             seen_signatures = set()
             unique = []
-            for ex in sorted_examples:
-                if score(ex) < 0:
-                    continue
+            while ranked:
+                neg_score, _, ex = heapq.heappop(ranked)
+                if neg_score > 0:
+                    break  # negative score; everything left is lower
                 # Create a rough signature from normalized code
-                sig = re.sub(r'\s+', ' ', ex.code[:150].lower())
+                sig = self._WHITESPACE_RE.sub(' ', ex.code[:150].lower())
                 if sig not in seen_signatures:
                     seen_signatures.add(sig)
                     unique.append(ex)
@@ -298,7 +320,7 @@ class DeterministicExtractor:
                 # Deduplicate signatures
                 seen = set()
                 for sig in content.signatures[construct_type][:10]:  # Limit to 10
-                    normalized = re.sub(r'\s+', ' ', sig.strip())
+                    normalized = self._WHITESPACE_RE.sub(' ', sig.strip())
                     if normalized not in seen and len(normalized) > 10:
                         seen.add(normalized)
                         output.append(sig)
@@ -22,6 +22,34 @@ EXCLUDE_PATTERNS = [
 
 EXCLUDE_DIRS = {"internals", "playground", "communityhub", "contributing"}
 
+_FRONTMATTER_RE = re.compile(r'^---\n.*?\n---\n?', re.DOTALL)
+_HTML_COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+_NAV_LINK_RE = re.compile(r'^(Next|Previous|Back|Continue):\s*\[.*?\]\(.*?\)\s*$', re.MULTILINE)
+_BADGE_RE = re.compile(r'!\[.*?\]\(https?://.*?badge.*?\)')
+_SHIELDS_RE = re.compile(r'!\[.*?\]\(https?://img\.shields\.io.*?\)')
+# A heading line whose next non-blank line is also a heading (empty section).
+_STACKED_HEADING_RE = re.compile(
+    r'^#{1,6}[^\S\n]+.*\n(?=(?:[^\S\n]*\n)*#{1,6}[^\S\n])', re.MULTILINE
+)
+_BLANK_RUN_RE = re.compile(r'\n{3,}')
+
+_CODE_FENCE_RE = re.compile(r'```(jac|python|py|javascript|js|bash|sh)?')
+_JAC_CONTENT_RE = re.compile(
+    '|'.join([
+        r'\+\+>',
+        r'-->',
+        r'by\s+llm',
+        r'with\s+entry',
+        r'\bspawn\b',
+        r'\bwalker\b',
+        r'\bnode\b',
+        r'\bedge\b',
+        r'\bcan\b\s+\w+',
+        r'::\w+:',
+    ]),
+    re.IGNORECASE
+)
+
 
 class Sanitizer:
     def __init__(self, config: dict):
@@ -42,29 +70,14 @@ class Sanitizer:
         return False
 
     def clean_markdown(self, text: str) -> str:
-        text = re.sub(r'^---\n.*?\n---\n?', '', text, flags=re.DOTALL)
-        text = re.sub(r'<!--.*?-->', '', text, flags=re.DOTALL)
-        text = re.sub(r'^(Next|Previous|Back|Continue):\s*\[.*?\]\(.*?\)\s*$', '', text, flags=re.MULTILINE)
-        text = re.sub(r'!\[.*?\]\(https?://.*?badge.*?\)', '', text)
-        text = re.sub(r'!\[.*?\]\(https?://img\.shields\.io.*?\)', '', text)
-
-        lines = text.split('\n')
-        cleaned = []
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if re.match(r'^#{1,6}\s+', line):
-                j = i + 1
-                while j < len(lines) and not lines[j].strip():
-                    j += 1
-                if j < len(lines) and re.match(r'^#{1,6}\s+', lines[j]):
-                    i += 1
-                    continue
-            cleaned.append(line)
-            i += 1
-
-        text = '\n'.join(cleaned)
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _FRONTMATTER_RE.sub('', text)
+        text = _HTML_COMMENT_RE.sub('', text)
+        text = _NAV_LINK_RE.sub('', text)
+        text = _BADGE_RE.sub('', text)
+        text = _SHIELDS_RE.sub('', text)
+
+        text = _STACKED_HEADING_RE.sub('', text)
+        text = _BLANK_RUN_RE.sub('\n\n', text)
 
         return text.strip()
 
@@ -72,24 +85,11 @@ class Sanitizer:
         if len(text) < self.min_content_length:
             return False
 
-        if re.search(r'```(jac|python|py|javascript|js|bash|sh)?', text):
+        if _CODE_FENCE_RE.search(text):
             return True
 
-        jac_patterns = [
-            r'\+\+>',
-            r'-->',
-            r'by\s+llm',
-            r'with\s+entry',
-            r'\bspawn\b',
-            r'\bwalker\b',
-            r'\bnode\b',
-            r'\bedge\b',
-            r'\bcan\b\s+\w+',
-            r'::\w+:',
-        ]
-        for p in jac_patterns:
-            if re.search(p, text, re.IGNORECASE):
-                return True
+        if _JAC_CONTENT_RE.search(text):
+            return True
 
         return len(text) > 500
 
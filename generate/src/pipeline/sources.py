@@ -3,12 +3,17 @@ import sqlite3
 import subprocess
 import tempfile
 import shutil
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional, Callable
 from enum import Enum
 
+# UPDATE ... RETURNING needs SQLite 3.35+; older libsqlite3 builds re-select.
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 
 class SourceType(str, Enum):
     DOCS = "docs"
@@ -80,10 +85,21 @@ class SourceManager:
     def __init__(self, config_path: Path):
         self.config_path = config_path
         self.db_path = config_path.parent / "sources.db"
+        # One connection per manager, shared across the API event loop and
+        # the fetch worker threads; the lock serializes access to it.
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL lets the API's manager read while the sanitizer's manager writes.
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._lock = threading.Lock()
+        # (PRAGMA data_version, serialized list()) for list_dicts().
+        self._dict_cache: Optional[tuple[int, list[dict]]] = None
         self._init_db()
 
+    @contextmanager
     def _get_conn(self):
-        return sqlite3.connect(self.db_path)
+        with self._lock, self._conn:
+            yield self._conn
 
     def _init_db(self):
         with self._get_conn() as conn:
@@ -107,8 +123,8 @@ class SourceManager:
             ''')
             conn.commit()
 
-            cursor = conn.execute('SELECT COUNT(*) FROM sources')
-            if cursor.fetchone()[0] == 0:
+            cursor = conn.execute('SELECT 1 FROM sources LIMIT 1')
+            if cursor.fetchone() is None:
                 self._add_default(conn)
 
     def _add_default(self, conn):
@@ -142,15 +158,12 @@ class SourceManager:
                     source.file_patterns
                 ))
                 conn.commit()
+                self._dict_cache = None
                 return source
             except sqlite3.IntegrityError:
                 raise ValueError(f"Source with id '{source.id}' already exists")
 
     def update(self, source_id: str, updates: dict) -> Source:
-        source = self.get(source_id)
-        if not source:
-            raise ValueError(f"Source '{source_id}' not found")
-
         allowed_fields = {'git_url', 'branch', 'path', 'source_type', 'enabled', 'file_patterns'}
         filtered = {k: v for k, v in updates.items() if k in allowed_fields}
 
@@ -162,21 +175,32 @@ class SourceManager:
             filtered['file_patterns'] = ','.join(filtered['file_patterns'])
 
         if not filtered:
+            source = self.get(source_id)
+            if not source:
+                raise ValueError(f"Source '{source_id}' not found")
             return source
 
         set_clause = ', '.join(f'{k} = ?' for k in filtered.keys())
         values = list(filtered.values()) + [source_id]
 
         with self._get_conn() as conn:
-            conn.execute(f'UPDATE sources SET {set_clause} WHERE id = ?', values)
+            if _HAS_RETURNING:
+                cursor = conn.execute(f'UPDATE sources SET {set_clause} WHERE id = ? RETURNING *', values)
+            else:
+                conn.execute(f'UPDATE sources SET {set_clause} WHERE id = ?', values)
+                cursor = conn.execute('SELECT * FROM sources WHERE id = ?', (source_id,))
+            row = cursor.fetchone()
+            if row is None:
+                raise ValueError(f"Source '{source_id}' not found")
             conn.commit()
-
-        return self.get(source_id)
+            self._dict_cache = None
+            return Source.from_row(row)
 
     def delete(self, source_id: str):
         with self._get_conn() as conn:
             cursor = conn.execute('DELETE FROM sources WHERE id = ?', (source_id,))
             conn.commit()
+            self._dict_cache = None
             if cursor.rowcount == 0:
                 raise ValueError(f"Source '{source_id}' not found")
 
@@ -191,6 +215,19 @@ class SourceManager:
             cursor = conn.execute('SELECT * FROM sources ORDER BY id')
             return [Source.from_row(row) for row in cursor.fetchall()]
 
+    def list_dicts(self) -> list[dict]:
+        """Return list() as dicts, cached until the table is written to.
+
+        Writes through this manager clear the cache; data_version catches
+        commits made on other connections. Callers must not mutate the result.
+        """
+        with self._get_conn() as conn:
+            version = conn.execute('PRAGMA data_version').fetchone()[0]
+            if self._dict_cache is None or self._dict_cache[0] != version:
+                cursor = conn.execute('SELECT * FROM sources ORDER BY id')
+                self._dict_cache = (version, [Source.from_row(row).to_dict() for row in cursor.fetchall()])
+            return self._dict_cache[1]
+
     def get_enabled(self) -> list[Source]:
         with self._get_conn() as conn:
             cursor = conn.execute('SELECT * FROM sources WHERE enabled = 1 ORDER BY id')
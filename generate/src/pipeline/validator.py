@@ -141,8 +141,11 @@ class Validator:
             size_ratio=size_ratio
         )
 
-    def validate_final(self, text, required_patterns=None):
-        """Validate final output has minimum required patterns."""
+    def validate_final(self, text, required_patterns=None, found=None):
+        """Validate final output has minimum required patterns.
+
+        Pass found (the result of find_patterns(text)) to skip rescanning.
+        """
         issues = []
 
         if required_patterns is None:
@@ -152,7 +155,8 @@ class Validator:
                 'typed connect: +>:', 'typed traversal: ->:',
             ]
 
-        found = self.find_patterns(text)
+        if found is None:
+            found = self.find_patterns(text)
         missing = [p for p in required_patterns if p not in found]
 
         if missing:
@@ -426,7 +430,8 @@ class Validator:
         text: str,
         fail_threshold: float = 90.0,
         on_progress: Optional[callable] = None,
-        max_workers: Optional[int] = None
+        max_workers: Optional[int] = None,
+        max_errors: Optional[int] = None
     ) -> JacCheckResult:
         """Run jac check on all fenced code blocks using parallel processing.
 
@@ -435,6 +440,7 @@ class Validator:
             fail_threshold: Minimum pass rate percentage (default 90%)
             on_progress: Optional callback(current, total, message)
             max_workers: Maximum threads (default: min(32, cpu_count * 2))
+            max_errors: Keep at most this many error entries (counts stay exact)
 
         Returns:
             JacCheckResult with comprehensive statistics
@@ -478,6 +484,8 @@ class Validator:
                     passed += 1
                 else:
                     failed += 1
+                    if max_errors is not None and len(errors) >= max_errors:
+                        continue
                     preview = code[:150].replace('\n', ' ')
                     errors.append({
                         "block": block_idx + 1,
@@ -61,7 +61,12 @@ def main():
 
     print("Starting backend on http://localhost:4000")
     backend = subprocess.Popen(
-        [sys.executable, "-m", "uvicorn", "src.api.main:app", "--host", "0.0.0.0", "--port", "4000", "--reload"],
+        [
+            sys.executable, "-m", "uvicorn", "src.api.main:app",
+            "--host", "0.0.0.0", "--port", "4000", "--reload",
+            # Events are small JSON; deflate would cost ~50 KiB of zlib state per client.
+            "--ws-per-message-deflate", "false",
+        ],
         cwd=ROOT,
         env=env,
         stdout=sys.stdout,